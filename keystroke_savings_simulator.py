@@ -0,0 +1,290 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+Offline simulation of the keystroke savings that the autocompletion of our custom input technique
+(see text_input_technique.py) could achieve at best, without having to run the study with human participants.
+
+For every word of the given texts the minimum number of keystrokes is calculated under the same rules as in the
+CompleterTextEdit: the popup appears as soon as more than two characters of a word have been entered and shows the
+first three completions, one of which can be selected with a single key press (1, 2 or 3). After a selection the popup
+only opens again with the next typed character, so a completion that is just the beginning of the word (e.g.
+"Frühling" for "Frühlingsmorgen") can be selected first and completed further afterwards. Typing a word without
+autocompletion costs one keystroke per character.
+
+The texts are either taken from the task and example texts of a setup file or from any plain text file (e.g. a large
+corpus). The keystrokes are simulated in parallel, the lookup latency of every engine is measured afterwards in a
+single process so that the measurement isn't disturbed by the other workers. The results for each completion engine
+configuration are printed to stdout in CSV format.
+
+Usage: keystroke_savings_simulator.py [setup_file_or_text_file] > output_file.csv
+"""
+
+import sys
+import os
+import re
+import json
+import random
+import timeit
+import bisect
+import multiprocessing
+from collections import Counter
+
+
+SETUP_FILE = "./setup.json"
+CORPUS_DIR = "."
+CORPUS_FILE = "tiger_release_aug07.corrected.16012013.conll09"
+
+# same values as in the CompleterTextEdit
+MIN_PREFIX_LENGTH = 3
+POPUP_ENTRY_COUNT = 3
+
+# the different completion engines that should be compared; "corpus_order" behaves like the QCompleter with an
+# unsorted model (as used in our input technique), the other two are possible alternatives
+ENGINE_CONFIGURATIONS = [
+    {"name": "corpus_order", "popup_entry_count": POPUP_ENTRY_COUNT},
+    {"name": "alphabetical", "popup_entry_count": POPUP_ENTRY_COUNT},
+    {"name": "frequency", "popup_entry_count": POPUP_ENTRY_COUNT},
+]
+
+CHUNK_SIZE = 500  # number of unique words that are sent to a worker process at once
+MAX_SPAWNED_PROCESSES = 2  # every spawned (not forked) process needs its own copy of the engines
+
+LATENCY_SAMPLE_SIZE = 200  # number of prefixes the lookup latency is measured with
+LATENCY_REPETITIONS = 5
+
+# the completion engines of a worker process, set by _init_worker() when the process is started
+_engines = dict()
+
+
+def fold_case(text: str) -> str:
+    """
+    Case insensitive matching like in the QCompleter, which lowers one character at a time. Unlike str.casefold() this
+    keeps the length of the text, e.g. "ß" stays "ß" instead of becoming "ss".
+    """
+    folded_text = text.lower()
+    if len(folded_text) == len(text):
+        return folded_text
+    # some characters (like "İ") become longer when lowered, only use their first character in that case
+    return "".join(char.lower()[0] for char in text)
+
+
+def build_prefix_dict(terms, popup_entry_count: int) -> dict[str, list[str]]:
+    # maps every (case folded) prefix that opens the popup to the first completions of the given terms
+    prefix_dict = dict()
+    for term in terms:
+        folded_term = fold_case(term)
+        for prefix_length in range(MIN_PREFIX_LENGTH, len(folded_term) + 1):
+            completions = prefix_dict.setdefault(folded_term[:prefix_length], [])
+            if len(completions) < popup_entry_count:
+                completions.append(term)
+    return prefix_dict
+
+
+class CorpusOrderEngine:
+    """
+    Returns the first matches in the order in which the terms appear in the corpus, just like the QCompleter does
+    with an unsorted model and a case insensitive MatchStartsWith filter. Instead of scanning all terms like the
+    QCompleter, all prefixes are precomputed so a lookup is a single dictionary access.
+    """
+
+    def __init__(self, terms: list[str], popup_entry_count: int):
+        self.popup_entry_count = popup_entry_count
+        self.prefix_dict = build_prefix_dict(terms, popup_entry_count)
+
+    def lookup(self, prefix: str) -> list[str]:
+        return self.prefix_dict.get(fold_case(prefix), [])
+
+
+class AlphabeticalEngine:
+    """
+    Returns the first matches in alphabetical (case insensitive) order by using a binary search on the sorted terms.
+    """
+
+    def __init__(self, terms: list[str], popup_entry_count: int):
+        self.popup_entry_count = popup_entry_count
+        sorted_terms = sorted((fold_case(term), term) for term in terms)
+        self.folded_terms = [folded_term for folded_term, _ in sorted_terms]
+        self.terms = [term for _, term in sorted_terms]
+
+    def lookup(self, prefix: str) -> list[str]:
+        prefix = fold_case(prefix)
+        completions = []
+        index = bisect.bisect_left(self.folded_terms, prefix)
+        while index < len(self.terms) and len(completions) < self.popup_entry_count:
+            if not self.folded_terms[index].startswith(prefix):
+                break
+            completions.append(self.terms[index])
+            index += 1
+        return completions
+
+
+class FrequencyEngine:
+    """
+    Returns the most frequent terms of the corpus for a prefix. All prefixes are precomputed so a lookup is a single
+    dictionary access.
+    """
+
+    def __init__(self, words: list[str], popup_entry_count: int):
+        self.popup_entry_count = popup_entry_count
+        self.prefix_dict = build_prefix_dict((term for term, _ in Counter(words).most_common()), popup_entry_count)
+
+    def lookup(self, prefix: str) -> list[str]:
+        return self.prefix_dict.get(fold_case(prefix), [])
+
+
+def create_engine(config: dict, words: list[str]):
+    terms = list(dict.fromkeys(words))  # remove duplicates but keep the corpus order (same as in CompleterTextEdit)
+    if config["name"] == "corpus_order":
+        return CorpusOrderEngine(terms, config["popup_entry_count"])
+    elif config["name"] == "alphabetical":
+        return AlphabeticalEngine(terms, config["popup_entry_count"])
+    elif config["name"] == "frequency":
+        return FrequencyEngine(words, config["popup_entry_count"])
+    else:
+        raise ValueError(f"Unknown completion engine: {config['name']}")
+
+
+def load_corpus_words() -> list[str]:
+    import nltk  # only needed for the real corpus, not for simulating with another term list
+
+    # the same corpus as the one used in the CompleterTextEdit
+    corpus = nltk.corpus.ConllCorpusReader(CORPUS_DIR, CORPUS_FILE, ['ignore', 'words', 'ignore', 'ignore', 'pos'],
+                                           encoding='utf-8')
+    return list(corpus.words())
+
+
+def load_texts(file_name: str) -> list[str]:
+    if not os.path.isfile(file_name):
+        sys.stderr.write("Given text file does not exist!")
+        exit(1)
+
+    with open(file_name, encoding='utf-8') as text_file:
+        if file_name.endswith(".json"):
+            # use the task and example texts of every condition in the setup file (each text only once)
+            conditions: dict = json.load(text_file)['conditions']
+            texts = []
+            for condition in conditions.values():
+                texts.extend([condition['example_text'], condition['task_text']])
+            return list(dict.fromkeys(texts))
+
+        # a plain text file is used as a single text, so every line break is counted as a keystroke as well
+        return [text_file.read()]
+
+
+def split_into_words(text: str) -> list[str]:
+    # the QCompleter only completes the word under the cursor, so punctuation is not part of a word
+    return re.findall(r"\w+", text)
+
+
+def get_min_keystrokes(word: str, engine) -> int:
+    """
+    Returns the minimum number of keystrokes needed to enter the given word. This is a shortest path over the number
+    of characters of the word that have been entered so far: typing the next character costs one keystroke, selecting
+    a completion that is (case sensitive) the beginning of the word costs one keystroke as well.
+    """
+    # keystrokes needed to reach each prefix length, once by typing the last character and once by a selection
+    typed = [0] + [len(word) + 1] * len(word)
+    selected = [len(word) + 1] * (len(word) + 1)
+
+    for prefix_length in range(len(word)):
+        typed[prefix_length + 1] = min(typed[prefix_length + 1],
+                                       min(typed[prefix_length], selected[prefix_length]) + 1)
+
+        # the popup only opens after a typed character (not right after a selection) and selecting a completion only
+        # saves keystrokes if at least two characters of the word remain
+        if prefix_length < MIN_PREFIX_LENGTH or prefix_length >= len(word) - 1:
+            continue
+        for completion in engine.lookup(word[:prefix_length]):
+            if len(completion) > prefix_length and word.startswith(completion):
+                selected[len(completion)] = min(selected[len(completion)], typed[prefix_length] + 1)
+
+    return min(typed[-1], selected[-1])
+
+
+def measure_lookup_latency(engine, prefixes: list[str]) -> float:
+    """
+    Returns the best average duration of a single lookup (in seconds) over several repetitions.
+    """
+    if not prefixes:
+        return 0.0
+
+    def lookup_all():
+        for prefix in prefixes:
+            engine.lookup(prefix)
+
+    return min(timeit.repeat(lookup_all, number=1, repeat=LATENCY_REPETITIONS)) / len(prefixes)
+
+
+def _init_worker(engines: dict) -> None:
+    # only called in the worker processes, the parent process keeps its engines local
+    _engines.update(engines)
+
+
+def _create_pool(engines: dict):
+    context = multiprocessing.get_context()
+    # forked processes share the memory of the parent process, spawned ones get their own copy of the engines
+    processes = None if context.get_start_method() == "fork" else MAX_SPAWNED_PROCESSES
+    return context.Pool(processes=processes, initializer=_init_worker, initargs=(engines,))
+
+
+def _simulate_chunk(word_counts: list[tuple[str, int]]) -> dict[str, int]:
+    # only the sums are sent back to keep the results small even for large corpora
+    return {engine_name: sum(get_min_keystrokes(word, engine) * count for word, count in word_counts)
+            for engine_name, engine in _engines.items()}
+
+
+def simulate(texts: list[str], corpus_words: list[str]) -> list[dict]:
+    engines = {config["name"]: create_engine(config, corpus_words) for config in ENGINE_CONFIGURATIONS}
+
+    # without autocompletion every character (including whitespace and punctuation) needs one keystroke
+    total_characters = sum(len(text) for text in texts)
+    # the result for a word is always the same, so every word only has to be simulated once
+    word_counts = list(Counter(word for text in texts for word in split_into_words(text)).items())
+    chunks = [word_counts[i:i + CHUNK_SIZE] for i in range(0, len(word_counts), CHUNK_SIZE)]
+
+    with _create_pool(engines) as pool:
+        chunk_results = pool.map(_simulate_chunk, chunks)
+
+    # the latency is measured with the prefixes that are looked up during the simulation
+    prefixes = list({word[:prefix_length] for word, _ in word_counts
+                     for prefix_length in range(MIN_PREFIX_LENGTH, len(word) - 1)})
+    prefixes = random.Random(0).sample(sorted(prefixes), min(LATENCY_SAMPLE_SIZE, len(prefixes)))
+
+    word_count = sum(count for _, count in word_counts)
+    word_characters = sum(len(word) * count for word, count in word_counts)
+    results = []
+    for config in ENGINE_CONFIGURATIONS:
+        word_keystrokes = sum(chunk_result[config["name"]] for chunk_result in chunk_results)
+        # only the keystrokes within words can be saved, the rest of the text has to be typed anyway
+        saved_keystrokes = word_characters - word_keystrokes
+        results.append({
+            'engine': config["name"],
+            'popup_entry_count': config["popup_entry_count"],
+            'word_count': word_count,
+            'keystrokes_without_completion': total_characters,
+            'keystrokes_with_completion': total_characters - saved_keystrokes,
+            'keystroke_savings': saved_keystrokes / total_characters if total_characters else 0.0,
+            'mean_lookup_time_in_s': measure_lookup_latency(engines[config["name"]], prefixes),
+        })
+
+    return results
+
+
+def main():
+    try:
+        text_file = sys.argv[1]
+    except IndexError as e:
+        print(f"No text file given as command line parameter! Using {SETUP_FILE}", file=sys.stderr)
+        text_file = SETUP_FILE
+
+    texts = load_texts(text_file)
+    results = simulate(texts, load_corpus_words())
+
+    print(','.join(results[0].keys()))
+    for result in results:
+        print(','.join(str(value) for value in result.values()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+Checks the completion rules of the keystroke savings simulator with a small term list. Run with
+```python3 -m pytest keystroke_savings_simulator_test.py```
+"""
+
+from keystroke_savings_simulator import create_engine, get_min_keystrokes, simulate
+
+TERMS = ["Seelen", "seelisch", "Seele", "Seen", "Seele", "Frühling", "Frühlingsmorgen", "Seelen", "Frühling"]
+
+
+def _engine(name, popup_entry_count=3):
+    return create_engine({"name": name, "popup_entry_count": popup_entry_count}, TERMS)
+
+
+def test_lookup_order():
+    assert _engine("corpus_order").lookup("see") == ["Seelen", "seelisch", "Seele"]
+    assert _engine("alphabetical").lookup("see") == ["Seele", "Seelen", "seelisch"]
+    assert _engine("frequency").lookup("see") == ["Seelen", "Seele", "seelisch"]
+    assert _engine("frequency").lookup("FRÜ") == ["Frühling", "Frühlingsmorgen"]
+    assert _engine("alphabetical").lookup("xyz") == []
+
+
+class _RecordingEngine:
+
+    def __init__(self):
+        self.prefixes = []
+
+    def lookup(self, prefix):
+        self.prefixes.append(prefix)
+        return []
+
+
+def test_top_three_limit():
+    terms = ["Seelen", "Seele", "Seeufer", "seelisch"]
+    engine = create_engine({"name": "corpus_order", "popup_entry_count": 3}, terms)
+    # "seelisch" is only the fourth match for "see" but the third one for "seel"
+    assert get_min_keystrokes("seelisch", engine) == 5
+    engine = create_engine({"name": "corpus_order", "popup_entry_count": 4}, terms)
+    assert get_min_keystrokes("seelisch", engine) == 4
+
+
+def test_min_prefix_length():
+    engine = _RecordingEngine()
+    assert get_min_keystrokes("Heiterkeit", engine) == 10
+    assert engine.prefixes[0] == "Hei"
+
+
+def test_no_saving_cutoff():
+    # selecting after typing all but one character costs as much as typing the last one
+    engine = _RecordingEngine()
+    get_min_keystrokes("Heiterkeit", engine)
+    assert engine.prefixes[-1] == "Heiterke"
+    engine = create_engine({"name": "corpus_order", "popup_entry_count": 3}, ["Seen"])
+    assert get_min_keystrokes("Seen", engine) == 4
+
+
+def test_case_sensitive_selection():
+    # the completion replaces the word, so it has to match the target word exactly
+    engine = create_engine({"name": "corpus_order", "popup_entry_count": 3}, ["seelen"])
+    assert get_min_keystrokes("Seelen", engine) == 6
+
+
+def test_chained_selection():
+    # "Frühling" (3 + 1), "s" (1), "Frühlingsmorgen" (1)
+    engine = create_engine({"name": "corpus_order", "popup_entry_count": 3},
+                           ["Frühling"] + [f"Frühling{i}" for i in range(3)] + ["Frühlingsmorgen"])
+    assert engine.lookup("Frü") == ["Frühling", "Frühling0", "Frühling1"]
+    assert get_min_keystrokes("Frühlingsmorgen", engine) == 6
+
+
+def test_sharp_s_is_not_folded():
+    # the QCompleter doesn't treat "ß" as "ss" when matching case insensitive
+    terms = ["Grosse", "Grossen", "Grossstadt", "Großmutter", "daß"]
+    for name in ["corpus_order", "alphabetical", "frequency"]:
+        engine = create_engine({"name": name, "popup_entry_count": 3}, terms)
+        assert engine.lookup("Groß") == ["Großmutter"]
+        assert "Großmutter" not in engine.lookup("Gross")
+        assert engine.lookup("GROSS") == engine.lookup("gross")
+        assert engine.lookup("daß") == ["daß"]
+        assert engine.lookup("das") == []
+        assert get_min_keystrokes("Großmutter", engine) == 5
+
+
+def test_simulate():
+    results = simulate(["Frühlingsmorgen, Seelen.\n"], TERMS)
+    assert [result['engine'] for result in results] == ["corpus_order", "alphabetical", "frequency"]
+    for result in results:
+        assert result['word_count'] == 2
+        assert result['keystrokes_without_completion'] == 25
+        # "Frühlingsmorgen" with 4 instead of 15 keystrokes and "Seelen" with 4 instead of 6
+        assert result['keystrokes_with_completion'] == 25 - 11 - 2